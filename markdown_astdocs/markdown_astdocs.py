@@ -33,6 +33,7 @@ markdown.markdown(src, extensions=[AstdocsExtension(path="./package")])
 
 '''
 
+import functools
 import pathlib
 import re
 from xml.etree.ElementTree import Element, SubElement
@@ -43,14 +44,108 @@ from markdown.core import Markdown
 from markdown.extensions import Extension
 from markdown.preprocessors import Preprocessor
 
-SOURCE_RE: str = r"%%%SOURCE (.*):([0-9]+):([0-9]+)"
-START_RE: str = r"%%%START ([A-Z]+) (.*)"
-END_RE: str = r"%%%END ([A-Z]+) (.*)"
+SOURCE_RE: re.Pattern[str] = re.compile(r"%%%SOURCE (.*):([0-9]+):([0-9]+)")
+START_RE: re.Pattern[str] = re.compile(r"%%%START ([A-Z]+) (.*)")
+END_RE: re.Pattern[str] = re.compile(r"%%%END ([A-Z]+) (.*)")
+BACKTICKS_RE: re.Pattern[str] = re.compile(r"`+")
+NEWLINE_RE: re.Pattern[str] = re.compile(r"\n")
+FENCE_RE: re.Pattern[str] = re.compile(r"^(`{3,}).*$", re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=128)
+def _read_source(path: str, mtime_ns: int) -> tuple[str, tuple[int, ...]]:
+    """Read (once) a source file and index the beginning of each of its lines.
+
+    Parameters
+    ----------
+    path : str
+        Path to the source file.
+    mtime_ns : int
+        Modification time of the source file, to invalidate the cache once edited.
+
+    Returns
+    -------
+    : str
+        Content of the file.
+    : tuple[int, ...]
+        Offsets of the beginning of each line, followed by the length of the content.
+
+    Notes
+    -----
+    Cached as a module is usually referred to by many `%%%SOURCE ...` markers; the
+    modification time is part of the key so edited sources are read again.
+
+    """
+    src = pathlib.Path(path).read_text()
+
+    offsets = [0] + [m.end() for m in NEWLINE_RE.finditer(src)]
+    if offsets[-1] != len(src):
+        offsets.append(len(src))
+
+    return src, tuple(offsets)
+
+
+@functools.lru_cache(maxsize=512)
+def _percent_source(
+    path: str,
+    lineno: int,
+    lineno_end: int | None,
+    mtime_ns: int,
+) -> str:
+    """Render (once) the HTML replacement of a `%%%SOURCE ...` marker.
+
+    Parameters
+    ----------
+    path : str
+        Path to the source file to extract code.
+    lineno : int
+        Beginning of the code block.
+    lineno_end : int
+        End of the code block.
+    mtime_ns : int
+        Modification time of the source file, to invalidate the cache once edited.
+
+    Returns
+    -------
+    : str
+        HTML replacement.
+
+    Notes
+    -----
+    Cached as the same snippet might be referred to from many pages; the modification
+    time is part of the key so edited sources are rendered again.
+
+    """
+    content, offsets = _read_source(path, mtime_ns)
+    n = len(offsets) - 1
+    start = offsets[min(lineno - 1, n)]
+    end = offsets[n if lineno_end is None else min(lineno_end, n)]
+    src = content[start:end].strip()
+
+    if "```" in src:
+        fence = "`" * (max(len(m.group(0)) for m in BACKTICKS_RE.finditer(src)) + 1)
+    else:
+        fence = "```"
+
+    return (
+        "<details>"
+        "<summary>source</summary>"
+        "\n\n"
+        f"{fence}python"
+        "\n"
+        f"{src}"
+        "\n"
+        f"{fence}"
+        "\n\n"
+        "</details>"
+    )
 
 
 class AstdocsSourcePreprocessor(Preprocessor):
     """Catch and replace the `%%%SOURCE ...` markers."""
 
+    __slots__ = ("path", "_path_prefix", "_substitute")
+
     def __init__(self, md: Markdown, path: str) -> None:
         """All methods inherited, but the `run()` one below.
 
@@ -69,6 +164,16 @@ class AstdocsSourcePreprocessor(Preprocessor):
         """
         super().__init__(md)
         self.path = path
+        self._path_prefix = f"{path.rstrip('/')}/"
+
+        # bound once; prefix and renderer are resolved as closure variables per match
+        prefix = self._path_prefix
+        percent_source = self.percent_source
+
+        def substitute(m: re.Match[str]) -> str:
+            return percent_source(prefix + m.group(1), int(m.group(2)), int(m.group(3)))
+
+        self._substitute = substitute
 
     @staticmethod
     def percent_source(
@@ -97,27 +202,8 @@ class AstdocsSourcePreprocessor(Preprocessor):
         Line numbers are expected to start at 1.
 
         """
-        with pathlib.Path(path).open() as f:
-            src = "".join(f.readlines()[lineno - 1 : lineno_end]).strip()
-
-        if "```" in src:
-            fences = sorted(re.findall(r"`+", src), key=len)
-            fence = "`" * (len(fences[-1]) + 1)
-        else:
-            fence = "```"
-
-        return (
-            "<details>"
-            "<summary>source</summary>"
-            "\n\n"
-            f"{fence}python"
-            "\n"
-            f"{src}"
-            "\n"
-            f"{fence}"
-            "\n\n"
-            "</details>"
-        )
+        mtime_ns = pathlib.Path(path).stat().st_mtime_ns
+        return _percent_source(path, lineno, lineno_end, mtime_ns)
 
     @staticmethod
     def percent_start() -> str:
@@ -154,35 +240,50 @@ class AstdocsSourcePreprocessor(Preprocessor):
         Returns
         -------
         : list[str]
-            Same list of lines, processed.
+            List of lines, processed.
 
         """
+        text = "\n".join(lines)
+
+        if "%%%SOURCE" not in text:
+            return lines
+
+        # no fence, nothing to escape: substitute the whole document at once
+        if "```" not in text:
+            return SOURCE_RE.sub(self._substitute, text).split("\n")
+
         escaped = 0
+        chunks = []
+        start = 0  # beginning of the current (un)escaped chunk
 
-        for i, line in enumerate(lines):
-            if line.startswith("```"):
-                escaped = line.count("`")
+        # only the fence lines can toggle the escaping, no need to visit the others
+        for m in FENCE_RE.finditer(text):
+            was_escaped = escaped
+            width = m.end(1) - m.start()
 
-            if escaped and line == escaped * "`":
+            if not escaped:
+                escaped = width
+            elif width == escaped and m.end() == m.end(1):
                 escaped = 0
 
-            if not escaped:
-                for m in re.finditer(SOURCE_RE, line):
-                    lines[i] = line.replace(
-                        m.group(0),
-                        self.percent_source(
-                            f"{self.path}/{m.group(1)}",
-                            int(m.group(2)),
-                            int(m.group(3)),
-                        ),
-                    )
+            if escaped and not was_escaped:
+                chunks.append(SOURCE_RE.sub(self._substitute, text[start : m.start()]))
+                start = m.start()
+            elif was_escaped and not escaped:
+                chunks.append(text[start : m.start()])
+                start = m.start()
 
-        return lines
+        chunk = text[start:]
+        chunks.append(chunk if escaped else SOURCE_RE.sub(self._substitute, chunk))
+
+        return "".join(chunks).split("\n")
 
 
 class AstdocsStartEndBlockProcessor(BlockProcessor):
     """Process `%%%START ...` to `%%%END ...` blocks."""
 
+    __slots__ = ("_start_match",)
+
     def __init__(self, parser: BlockParser) -> None:
         """All methods inherited, but the `test()` and `run()` ones below.
 
@@ -193,6 +294,7 @@ class AstdocsStartEndBlockProcessor(BlockProcessor):
 
         """
         super().__init__(parser)
+        self._start_match: re.Match[str] | None = None
 
     def test(self, parent: Element, block: str) -> bool:
         """Check if the `run()` method should be called to process the block.
@@ -210,7 +312,8 @@ class AstdocsStartEndBlockProcessor(BlockProcessor):
             `True` if pattern is found, `False` otherwise.
 
         """
-        return re.match(START_RE, block) is not None
+        self._start_match = START_RE.match(block)
+        return self._start_match is not None
 
     def run(self, parent: Element, blocks: list[str]) -> None:
         """Bound the block within the remaining blocks and render it.
@@ -224,17 +327,22 @@ class AstdocsStartEndBlockProcessor(BlockProcessor):
 
         """
         block = blocks[0]
-        blocks[0] = re.sub(START_RE, "", blocks[0])
+        m = self._start_match or START_RE.match(block)  # match kept from test()
+        if m is not None:
+            blocks[0] = block[m.end() :]
+        self._start_match = None
 
         for i, b in enumerate(blocks):
-            if re.search(END_RE, b):
-                blocks[i] = re.sub(END_RE, "", b)
+            # locate the fixed prefix first, only then search for a valid marker from it
+            idx = b.find("%%%END ")
+            m = END_RE.search(b, idx) if idx != -1 else None
+            if m is not None:
+                blocks[i] = b[: m.start()] + b[m.end() :]
 
                 e = SubElement(parent, "div", attrib={"class": "objectdef"})
                 self.parser.parseBlocks(e, blocks[0 : i + 1])
 
-                for _ in range(i + 1):
-                    blocks.pop(0)
+                del blocks[: i + 1]
 
                 return  # we done here
 
@@ -244,6 +352,8 @@ class AstdocsStartEndBlockProcessor(BlockProcessor):
 class AstdocsExtension(Extension):
     """Extension to be imported when calling for the renderer."""
 
+    __slots__ = ("config",)
+
     def __init__(self, path: str = ".", **kwargs) -> None:
         """Make the extension configurable.
 